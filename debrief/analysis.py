@@ -1,15 +1,262 @@
 """Analyzes Python codebase to extract definitions and imports."""
 
 import ast
+import hashlib
+import inspect
+import io
 import logging
+import multiprocessing
 import os
-from pathlib import Path
-
-from .ignore import is_ignored
-from .resolve import format_fenced_block
+import pickle
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import chain, islice
+
+from .ignore import IgnoreMatcher
+from .linting import ProjectLinter
+from .resolve import _RACY_MTIME_NS, format_fenced_block
 
 logger = logging.getLogger(__name__)
 
+# Below this many files, process start-up costs more than it saves.
+PARALLEL_MIN_FILES = 32
+
+# Reader threads and read-ahead depth when parsing in a single process.
+PREFETCH_THREADS = 16
+PREFETCH_WINDOW = 64
+
+# Paths the directory walker may queue ahead of the parsers.
+WALK_QUEUE_SIZE = 256
+
+# Parser processes start while the walker thread is running, and forking a
+# multi-threaded process can deadlock the child, so start them from a fork
+# server where the platform has one (elsewhere the default is spawn).
+_POOL_CONTEXT = (
+    multiprocessing.get_context("forkserver")
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else None
+)
+
+# Bump whenever the shape of cached per-file results changes.
+CACHE_VERSION = 5
+
+# Cache files already loaded or written by this process, keyed by path, so
+# repeated scans in one process (editor integrations, watchers) skip the
+# unpickling. Entries are still validated per file by mtime and size.
+_MEMORY_CACHE: dict[str, tuple[tuple, dict]] = {}
+
+# ast.parse only produces the exact node classes, never subclasses, so
+# dispatch can use type identity and set membership instead of isinstance.
+_IMPORT_NODES = frozenset((ast.Import, ast.ImportFrom))
+_FUNCTION_NODES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef))
+
+# Per-file analyzers never walk, so they share one empty matcher instead of
+# compiling a fresh one for every parsed file.
+_NO_PATTERNS = IgnoreMatcher(())
+
+_INDENTS = {level: " " * level for level in range(0, 16, 2)}
+
+
+# (rel_path, import targets, definitions text, doc total, doc missing,
+# short docstring names), as produced by _parse_one.
+_ParseResult = tuple[str, list[tuple[str, str]] | None, str, int, int, list[str]]
+
+
+@dataclass(frozen=True)
+class _ScanOptions:
+    """Analyzer settings shipped to worker processes."""
+
+    root: str
+    include_docstrings: bool
+    max_class_methods: int
+    max_module_defs: int
+
+
+def _clean_docstring(doc: str | None) -> str | None:
+    """Equivalent to ast.get_docstring, with a fast path for one-liners.
+
+    inspect.cleandoc of a single line without tabs only strips leading
+    whitespace, so the full dedent pass is skipped for the most common
+    docstring shape.
+
+    Args:
+        doc: A raw docstring as returned by raw_docstring.
+
+    Returns:
+        The cleaned docstring, or None if doc is None.
+    """
+    if doc is None:
+        return None
+    if "\n" not in doc and "\t" not in doc:
+        return doc.lstrip()
+    return inspect.cleandoc(doc)
+
+
+def _unparse(node: ast.expr) -> str:
+    """Unparses an expression, building plain and dotted names directly.
+
+    Annotations and base classes are mostly bare or dotted names, which
+    do not need the full ast.unparse machinery.
+
+    Args:
+        node: The expression node.
+
+    Returns:
+        The source representation of node.
+    """
+    if type(node) is ast.Name:
+        return node.id
+    if type(node) is ast.Attribute:
+        parts = [node.attr]
+        value = node.value
+        while type(value) is ast.Attribute:
+            parts.append(value.attr)
+            value = value.value
+        if type(value) is ast.Name:
+            parts.append(value.id)
+            return ".".join(reversed(parts))
+    return ast.unparse(node)
+
+
+@lru_cache(maxsize=2048)
+def _resolve_module(base_dir: str, module: str, root: str) -> str | None:
+    """Resolves a module name against a base directory to a file in root.
+
+    Cached because the same module is typically imported from many files
+    in the same package; Analyzer.scan clears it so results never outlive
+    a scan.
+
+    Args:
+        base_dir: Directory the module path is relative to.
+        module: Dotted module name.
+        root: Absolute project root.
+
+    Returns:
+        The path of the module file relative to root, or None.
+    """
+    parts = module.split(".")
+
+    candidate_path = os.path.join(base_dir, *parts) + ".py"
+    candidate_pkg = os.path.join(base_dir, *parts, "__init__.py")
+
+    target = None
+    if os.path.isfile(candidate_path):
+        target = candidate_path
+    elif os.path.isfile(candidate_pkg):
+        target = candidate_pkg
+
+    # Candidates are built from normalized absolute paths, so the relative
+    # path is a plain slice once the root prefix is confirmed.
+    root_prefix = root if root.endswith(os.sep) else root + os.sep
+    if target and target.startswith(root_prefix):
+        return target[len(root_prefix) :]
+
+    return None
+
+
+def _read_source(path: str) -> bytes | None:
+    """Reads a file's raw bytes, returning None if it cannot be read."""
+    try:
+        with open(path, "rb") as source_file:
+            return source_file.read()
+    except OSError:
+        return None
+
+
+def _prefetch_sources(
+    work: Iterable[tuple[str, str]],
+) -> Iterator[tuple[str, str, bytes | None]]:
+    """Reads files on a thread pool, yielding their contents in order.
+
+    Reads release the GIL, so keeping a bounded window of them in flight
+    hides disk latency behind parsing in the consuming thread.
+
+    Args:
+        work: (absolute path, relative path) tuples of the files to read.
+
+    Yields:
+        (path, rel_path, contents) tuples in input order; contents is None
+        if the file could not be read.
+    """
+    with ThreadPoolExecutor(max_workers=PREFETCH_THREADS) as executor:
+        pending: deque[tuple[str, str, Future]] = deque()
+        for path, rel_path in work:
+            pending.append((path, rel_path, executor.submit(_read_source, path)))
+            if len(pending) >= PREFETCH_WINDOW:
+                path, rel_path, future = pending.popleft()
+                yield path, rel_path, future.result()
+        while pending:
+            path, rel_path, future = pending.popleft()
+            yield path, rel_path, future.result()
+
+
+def _parse_one(
+    options: _ScanOptions, path: str, rel_path: str, source: bytes | None = None
+) -> _ParseResult:
+    """Analyzes a single file in isolation, suitable for a worker process.
+
+    Imports are returned unresolved, as (base directory, module) pairs,
+    because whether they point at a project file depends on which files
+    exist; that way cached results stay valid when files come and go.
+
+    Args:
+        options: Analyzer settings.
+        path: Absolute path to the file.
+        rel_path: Relative path from the project root.
+        source: The file's contents if already read; read from path if None.
+
+    Returns:
+        A tuple of (rel_path, import targets, definitions text, documented
+        node count, missing docstring count, short_docstrings). import
+        targets is None if the file failed to parse.
+    """
+    linter = ProjectLinter(options.root, include_docstrings=options.include_docstrings)
+    analyzer = Analyzer(
+        options.root,
+        linter,
+        _NO_PATTERNS,
+        include_docstrings=options.include_docstrings,
+        max_class_methods=options.max_class_methods,
+        max_module_defs=options.max_module_defs,
+    )
+    if source is None:
+        source = _read_source(path)
+    if source is None:
+        logger.debug("Failed to read %s", rel_path)
+    else:
+        # Imports stay unresolved here; _merge_result resolves them once in
+        # the scanning analyzer.
+        analyzer._collect_source(source, path, rel_path)
+    return (
+        rel_path,
+        analyzer.import_targets.get(rel_path),
+        analyzer.get_definitions_text(),
+        linter.doc_total,
+        linter.doc_missing,
+        linter.short_docstrings,
+    )
+
+
+def _parse_work_item(options: _ScanOptions, item: tuple[str, str]) -> _ParseResult:
+    """Runs _parse_one on a (path, rel_path) tuple, for Executor.map."""
+    return _parse_one(options, *item)
+
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    """Returns (mtime_ns, size) for path, or None if it cannot be stat'ed."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
 
 class Analyzer:
     """Analyzes the Python codebase to extract definitions and imports."""
@@ -17,21 +264,25 @@ class Analyzer:
     def __init__(
         self,
         root: str,
-        linter: "ProjectLinter",  # noqa: F821
-        patterns: list[str],
+        linter: ProjectLinter,
+        patterns: IgnoreMatcher,
         include_docstrings: bool = True,
         max_class_methods: int = 5,
         max_module_defs: int = 20,
+        max_workers: int | None = None,
+        cache_dir: str | None = None,
     ) -> None:
         """Initializes the Analyzer.
 
         Args:
             root: Project root path.
             linter: ProjectLinter instance.
-            patterns: List of gitignore patterns.
+            patterns: Compiled ignore patterns.
             include_docstrings: Whether to include docstrings in the output.
             max_class_methods: Max public methods to show per class.
             max_module_defs: Max top-level definitions to show per module.
+            max_workers: Number of parser processes (None for one per CPU).
+            cache_dir: Directory for the per-file result cache (None disables).
         """
         self.root = os.path.abspath(root)
         self.linter = linter
@@ -39,138 +290,342 @@ class Analyzer:
         self.include_docstrings = include_docstrings
         self.max_class_methods = max_class_methods
         self.max_module_defs = max_module_defs
-        self.definitions: list[str] = []
-        self.import_graph: dict[str, set[str]] = {}
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self._definitions = io.StringIO()
+        self.import_graph: defaultdict[str, set[str]] = defaultdict(set)
+        self.import_targets: dict[str, list[tuple[str, str]]] = {}
 
-    def get_arg_str(self, arg: ast.arg) -> str:
-        """Formats an argument node into a string representation."""
-        sig = arg.arg
-        if arg.annotation:
-            try:
-                sig += f": {ast.unparse(arg.annotation)}"
-            except Exception:
-                logger.debug(
-                    "Failed to unparse annotation for %s", arg.arg, exc_info=True
-                )
-        return sig
-
-    def _format_docstring(self, node: ast.AST, indent_level: int) -> list[str]:
-        """Helper to format docstrings with correct indentation."""
-        doc = ast.get_docstring(node)
-        lines: list[str] = []
-        if doc:
-            doc_str = f'"""\n{doc}\n"""'
-            indent = " " * indent_level
-            for line in doc_str.splitlines():
-                lines.append(f"{indent}{line}")
-        return lines
-
-    def _resolve_import(
-        self, current_file_abs: str, module: str, level: int = 0
-    ) -> str | None:
-        """Resolves an AST import node to a potential local file path.
+    @property
+    def definitions(self) -> list[str]:
+        """The Module Definitions section collected so far, as lines."""
+        return self._definitions.getvalue().splitlines()
 
-        Args:
-            current_file_abs: Absolute path of the current file.
-            module: The module name being imported.
-            level: The relative import level (0 for absolute).
+    def get_definitions_text(self) -> str:
+        """Returns the Module Definitions section collected so far.
 
         Returns:
-            The relative path from self.root if found, else None.
+            One markdown heading and fenced block per module, in scan order.
         """
-        if module is None:
+        return self._definitions.getvalue()
+
+    def get_arg_str(self, arg: ast.arg) -> str:
+        """Formats an argument node into a string representation."""
+        annotation = arg.annotation
+        if annotation is None:
+            return arg.arg
+        try:
+            return f"{arg.arg}: {_unparse(annotation)}"
+        except Exception:
+            logger.debug("Failed to unparse annotation for %s", arg.arg, exc_info=True)
+            return arg.arg
+
+    def _format_docstring(self, raw_doc: str | None, indent_level: int) -> str | None:
+        """Helper to format a docstring as one indented, newline-joined block."""
+        doc = _clean_docstring(raw_doc)
+        if not doc:
             return None
+        doc_str = f'"""\n{doc}\n"""'
+        indent = _INDENTS.get(indent_level) or " " * indent_level
+        return "\n".join(indent + line for line in doc_str.splitlines())
 
+    def _import_base_dir(self, current_file_abs: str, level: int) -> str:
+        """Returns the directory an import of the given level is relative to."""
         if level > 0:
             base_dir = os.path.dirname(current_file_abs)
             for _ in range(level - 1):
                 base_dir = os.path.dirname(base_dir)
-        else:
-            base_dir = self.root
+            return base_dir
+        return self.root
+
+    def _resolve_targets(self, targets: Iterable[tuple[str, str]]) -> set[str]:
+        """Resolves (base directory, module) import targets to project files."""
+        root = self.root
+        resolved = {
+            _resolve_module(base_dir, module, root) for base_dir, module in targets
+        }
+        resolved.discard(None)
+        return resolved
+
+    def _iter_files(self) -> Iterator[tuple[str, str]]:
+        """Walks the project and yields the Python files to analyze.
+
+        Yields:
+            (absolute path, relative path) tuples in walk order.
+        """
+        matches = self.patterns.matches_child
+        # Same order as a top-down os.walk: a directory's files, then each
+        # subdirectory depth-first. Ignored directories are never listed.
+        stack = [(self.root, "")]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        rel = f"{rel_dir}{os.sep}{name}" if rel_dir else name
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            if not matches(rel, name) and not entry.is_symlink():
+                                subdirs.append((entry.path, rel))
+                        elif name.endswith(".py") and not matches(rel, name):
+                            yield entry.path, rel
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
+
+    def _iter_files_threaded(self) -> Iterator[tuple[str, str]]:
+        """Runs _iter_files on a producer thread and yields its results.
+
+        Directory listing blocks in the kernel with the GIL released, so
+        walking on its own thread overlaps it with parsing.
+
+        Yields:
+            (absolute path, relative path) tuples in walk order.
+        """
+        items: queue.Queue = queue.Queue(maxsize=WALK_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+        errors: list[BaseException] = []
 
-        parts = module.split(".")
+        def produce() -> None:
+            try:
+                for item in self._iter_files():
+                    if stop.is_set():
+                        return
+                    items.put(item)
+            except Exception as error:  # noqa: BLE001 - re-raised by the consumer
+                errors.append(error)
+            finally:
+                items.put(done)
+
+        walker = threading.Thread(target=produce, name="debrief-walk", daemon=True)
+        walker.start()
+        finished = False
+        try:
+            while (item := items.get()) is not done:
+                yield item
+            finished = True
+        finally:
+            if not finished:
+                # Unblock the producer, which may be waiting on a full queue.
+                stop.set()
+                while walker.is_alive():
+                    try:
+                        items.get(timeout=0.05)
+                    except queue.Empty:
+                        pass
+        walker.join()
+        if errors:
+            raise errors[0]
+
+    def _cache_path(self) -> str | None:
+        """Returns the cache file for this project root, if caching is on."""
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"ast-{digest}.pkl")
 
-        candidate_path = os.path.join(base_dir, *parts) + ".py"
-        candidate_pkg = os.path.join(base_dir, *parts, "__init__.py")
+    def _load_cache(self, header: tuple) -> dict:
+        """Loads cached per-file results, discarding them on header mismatch.
 
-        target = None
-        if os.path.isfile(candidate_path):
-            target = candidate_path
-        elif os.path.isfile(candidate_pkg):
-            target = candidate_pkg
+        Args:
+            header: Version and settings tuple the cache must have been
+                written with.
 
-        if target and target.startswith(self.root):
-            return os.path.relpath(target, self.root)
+        Returns:
+            A mapping of relative path to (mtime_ns, size, result).
+        """
+        cache_path = self._cache_path()
+        if cache_path is None:
+            return {}
+        cached = _MEMORY_CACHE.get(cache_path)
+        if cached is None:
+            try:
+                with open(cache_path, "rb") as cache_file:
+                    cached = pickle.load(cache_file)
+            except FileNotFoundError:
+                return {}
+            except Exception:
+                logger.debug("Failed to load cache %s", cache_path, exc_info=True)
+                return {}
+            _MEMORY_CACHE[cache_path] = cached
+        cached_header, entries = cached
+        if cached_header != header:
+            return {}
+        return entries
+
+    def _save_cache(self, header: tuple, entries: dict) -> None:
+        """Writes per-file results to the cache atomically and in memory."""
+        cache_path = self._cache_path()
+        if cache_path is None:
+            return
+        _MEMORY_CACHE[cache_path] = (header, entries)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as cache_file:
+                pickle.dump((header, entries), cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            logger.debug("Failed to write cache %s", cache_path, exc_info=True)
 
-        return None
+    def _parse_all(
+        self, options: _ScanOptions, work: Iterable[tuple[str, str]]
+    ) -> list[_ParseResult]:
+        """Parses files, in a process pool when there are enough of them.
+
+        work is consumed lazily, so files are parsed while it is still
+        being produced.
+
+        Args:
+            options: Analyzer settings for _parse_one.
+            work: (absolute path, relative path) tuples.
+
+        Returns:
+            The _parse_one results, in the order of work.
+        """
+        work = iter(work)
+        workers = self.max_workers or os.cpu_count() or 1
+        head = list(islice(work, PARALLEL_MIN_FILES)) if workers > 1 else []
+        if len(head) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=_POOL_CONTEXT
+            ) as executor:
+                parse_item = partial(_parse_work_item, options)
+                return list(executor.map(parse_item, chain(head, work), chunksize=8))
+        return [
+            _parse_one(options, path, rel_path, source)
+            for path, rel_path, source in _prefetch_sources(chain(head, work))
+        ]
 
     def scan(self) -> None:
-        """Scans the project directory for Python files and analyzes them."""
-        for root, dirs, files in os.walk(self.root):
-            dirs[:] = [
-                dir_name
-                for dir_name in dirs
-                if not is_ignored(
-                    os.path.join(root, dir_name), self.root, self.patterns
-                )
-            ]
-            for file in files:
-                if file.endswith(".py"):
-                    full = os.path.join(root, file)
-                    if is_ignored(full, self.root, self.patterns):
-                        continue
-                    rel = os.path.relpath(full, self.root)
-                    self.analyze_file(full, rel)
+        """Scans the project directory for Python files and analyzes them.
+
+        The directory walk runs on its own thread and feeds the parsers as
+        it goes. Unchanged files (same mtime and size) are served from the
+        cache, except those modified in the last couple of seconds; the
+        rest are parsed in a process pool when there are enough of them to
+        amortize the start-up cost. Results are merged in walk order.
+        """
+        _resolve_module.cache_clear()
+        options = _ScanOptions(
+            self.root,
+            self.include_docstrings,
+            self.max_class_methods,
+            self.max_module_defs,
+        )
+        # The cache directory is shared between interpreters, and what
+        # parses (and how) depends on the Python version.
+        header = (CACHE_VERSION, sys.implementation.cache_tag, options)
+        cache = self._load_cache(header)
+        # A same-size edit within the mtime tick of a cached stamp would
+        # go unnoticed, so files this recently modified are not cached.
+        cacheable_before = time.time_ns() - _RACY_MTIME_NS
+
+        walked: list[tuple[str, str, tuple[int, int] | None]] = []
+        results: list[_ParseResult | None] = []
+        misses: list[int] = []
+
+        def lookup() -> Iterator[tuple[str, str]]:
+            for path, rel in self._iter_files_threaded():
+                stamp = _stamp(path)
+                walked.append((path, rel, stamp))
+                entry = cache.get(rel)
+                if entry is not None and entry[:2] == stamp:
+                    results.append(entry[2])
+                else:
+                    misses.append(len(results))
+                    results.append(None)
+                    yield path, rel
+
+        for index, result in zip(misses, self._parse_all(options, lookup())):
+            results[index] = result
+
+        new_cache = {}
+        for (_, rel, stamp), result in zip(walked, results):
+            self._merge_result(*result)
+            if stamp is not None and stamp[0] < cacheable_before:
+                new_cache[rel] = (*stamp, result)
+        if misses or len(new_cache) != len(cache):
+            self._save_cache(header, new_cache)
+
+    def _merge_result(
+        self,
+        rel_path: str,
+        import_targets: list[tuple[str, str]] | None,
+        file_definitions: str,
+        doc_total: int,
+        doc_missing: int,
+        short_docstrings: list[str],
+    ) -> None:
+        """Merges the output of _parse_one into this analyzer and its linter."""
+        if import_targets is not None:
+            self.import_graph[rel_path].update(self._resolve_targets(import_targets))
+        self._definitions.write(file_definitions)
+        self.linter.merge_stats(doc_total, doc_missing, short_docstrings)
 
     def _handle_import(
-        self, node: ast.Import | ast.ImportFrom, path: str, rel_path: str
+        self,
+        node: ast.Import | ast.ImportFrom,
+        path: str,
+        targets: list[tuple[str, str]],
     ) -> None:
-        if isinstance(node, ast.Import):
+        if type(node) is ast.Import:
             for alias in node.names:
-                resolved = self._resolve_import(path, alias.name, level=0)
-                if resolved:
-                    self.import_graph[rel_path].add(resolved)
-        elif isinstance(node, ast.ImportFrom):
+                targets.append((self.root, alias.name))
+        else:
             mod_name = node.module if node.module else ""
-            resolved = self._resolve_import(path, mod_name, level=node.level)
-            if resolved:
-                self.import_graph[rel_path].add(resolved)
+            targets.append((self._import_base_dir(path, node.level), mod_name))
 
     def _handle_class(self, node: ast.ClassDef, file_defs: list[str]) -> None:
-        self.linter.track_doc(node)
-        bases = [ast.unparse(base_class) for base_class in node.bases]
+        raw_doc = self.linter.track_doc(node)
+        bases = [_unparse(base_class) for base_class in node.bases]
         base_str = f"({', '.join(bases)})" if bases else ""
         file_defs.append(f"- class {node.name}{base_str}")
         if self.include_docstrings:
-            file_defs.extend(self._format_docstring(node, 2))
+            doc = self._format_docstring(raw_doc, 2)
+            if doc:
+                file_defs.append(doc)
 
+        max_methods = self.max_class_methods
+        if max_methods <= 0:
+            return
+        track_doc = self.linter.track_doc
+        get_arg_str = self.get_arg_str
+        include_docstrings = self.include_docstrings
         method_count = 0
         for item in node.body:
-            if isinstance(
-                item, (ast.FunctionDef, ast.AsyncFunctionDef)
-            ) and not item.name.startswith("_"):
-                if method_count < self.max_class_methods:
-                    self.linter.track_doc(item)
-                    args = [self.get_arg_str(arg) for arg in item.args.args]
-                    prefix = (
-                        "async def" if isinstance(item, ast.AsyncFunctionDef) else "def"
-                    )
-                    file_defs.append(f"  - {prefix} {item.name}({', '.join(args)})")
-                    if self.include_docstrings:
-                        file_defs.extend(self._format_docstring(item, 4))
-                    method_count += 1
+            if type(item) in _FUNCTION_NODES and not item.name.startswith("_"):
+                raw_doc = track_doc(item)
+                args = [get_arg_str(arg) for arg in item.args.args]
+                prefix = "async def" if type(item) is ast.AsyncFunctionDef else "def"
+                file_defs.append(f"  - {prefix} {item.name}({', '.join(args)})")
+                if include_docstrings:
+                    doc = self._format_docstring(raw_doc, 4)
+                    if doc:
+                        file_defs.append(doc)
+                method_count += 1
+                if method_count >= max_methods:
+                    break
 
     def _handle_function(
         self, node: ast.FunctionDef | ast.AsyncFunctionDef, file_defs: list[str]
     ) -> None:
         if not node.name.startswith("_"):
-            self.linter.track_doc(node)
+            raw_doc = self.linter.track_doc(node)
             args = [self.get_arg_str(arg) for arg in node.args.args]
-            ret = f" -> {ast.unparse(node.returns)}" if node.returns else ""
-            prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+            ret = f" -> {_unparse(node.returns)}" if node.returns else ""
+            prefix = "async def" if type(node) is ast.AsyncFunctionDef else "def"
             file_defs.append(f"- {prefix} {node.name}({', '.join(args)}){ret}")
             if self.include_docstrings:
-                file_defs.extend(self._format_docstring(node, 2))
+                doc = self._format_docstring(raw_doc, 2)
+                if doc:
+                    file_defs.append(doc)
 
     def analyze_file(self, path: str, rel_path: str) -> None:
         """Parses and analyzes a single Python file.
@@ -182,37 +637,74 @@ class Analyzer:
             rel_path: Relative path from the project root.
         """
         try:
-            source = Path(path).read_text(encoding="utf-8")
-            tree = ast.parse(source)
-        except Exception:
-            logger.debug("Failed to parse %s", rel_path, exc_info=True)
+            with open(path, "rb") as source_file:
+                source = source_file.read()
+        except OSError:
+            logger.debug("Failed to read %s", rel_path, exc_info=True)
             return
+        self.analyze_source(source, path, rel_path)
 
-        file_defs: list[str] = []
-        def_count = 0
+    def analyze_source(self, source: bytes, path: str, rel_path: str) -> None:
+        """Parses and analyzes the already-read contents of a Python file.
 
-        if rel_path not in self.import_graph:
-            self.import_graph[rel_path] = set()
+        Args:
+            source: Raw file contents.
+            path: Absolute path to the file.
+            rel_path: Relative path from the project root.
+        """
+        self._collect_source(source, path, rel_path)
+        import_targets = self.import_targets.get(rel_path)
+        if import_targets is not None:
+            self.import_graph[rel_path].update(self._resolve_targets(import_targets))
 
-        for node in tree.body:
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                self._handle_import(node, path, rel_path)
+    def _collect_source(self, source: bytes, path: str, rel_path: str) -> None:
+        """Records a file's definitions and unresolved import targets."""
+        try:
+            tree = compile(
+                source, path, "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True
+            )
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            # Deeply nested expressions exhaust the parser's recursion limit
+            # or memory rather than raising SyntaxError.
+            logger.debug("Failed to parse %s", rel_path, exc_info=True)
+            return
 
-            elif isinstance(node, ast.ClassDef):
-                if def_count < self.max_module_defs:
-                    self._handle_class(node, file_defs)
-                    def_count += 1
+        file_defs: list[str] = []
+        import_targets: list[tuple[str, str]] = []
+        def_count = 0
 
-            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                if def_count < self.max_module_defs:
-                    self._handle_function(node, file_defs)
-                    def_count += 1
+        handle_import = self._handle_import
+        handle_class = self._handle_class
+        handle_function = self._handle_function
+        max_defs = self.max_module_defs
+        body = tree.body
+        for index, node in enumerate(body):
+            if def_count >= max_defs:
+                # Definition budget spent: only late imports still matter.
+                for late_node in body[index:]:
+                    if type(late_node) in _IMPORT_NODES:
+                        handle_import(late_node, path, import_targets)
+                break
+
+            node_type = type(node)
+            if node_type in _IMPORT_NODES:
+                handle_import(node, path, import_targets)
+
+            elif node_type is ast.ClassDef:
+                handle_class(node, file_defs)
+                def_count += 1
+
+            elif node_type in _FUNCTION_NODES:
+                handle_function(node, file_defs)
+                def_count += 1
+
+        self.import_targets[rel_path] = import_targets
 
         if file_defs:
-            self.definitions.append(f"\n### {rel_path}\n\n")
             block_content = "\n".join(file_defs)
-            self.definitions.append(format_fenced_block(block_content, "text"))
-            self.definitions.append("")
+            self._definitions.write(f"\n### {rel_path}\n\n")
+            self._definitions.write(format_fenced_block(block_content, "text"))
+            self._definitions.write("\n")
 
     def _find_root_files(self) -> list[str]:
         """Finds root files that are not imported by any other file.
@@ -220,15 +712,8 @@ class Analyzer:
         Returns:
             List of root file paths sorted alphabetically.
         """
-        imported_files: set[str] = set()
-        for imports in self.import_graph.values():
-            imported_files.update(imports)
-
-        roots = [
-            file_object
-            for file_object in self.import_graph
-            if file_object not in imported_files
-        ]
+        imported_files = set().union(*self.import_graph.values())
+        roots = self.import_graph.keys() - imported_files
         return sorted(roots) if roots else sorted(self.import_graph.keys())
 
     def _format_visited_node(
@@ -259,31 +744,43 @@ class Analyzer:
             return "No imports found."
 
         roots = self._find_root_files()
+        sorted_children = {
+            file_node: sorted(children)
+            for file_node, children in self.import_graph.items()
+        }
         output: list[str] = []
         globally_visited: set[str] = set()
         current_path: set[str] = set()
 
-        def _build_tree(file_node: str, prefix: str = "") -> None:
-            if file_node in current_path:
-                output.append(f"{prefix}- {file_node} (cycle)")
-                return
-
-            children = sorted(self.import_graph.get(file_node, []))
-            if file_node in globally_visited:
-                output.append(self._format_visited_node(file_node, prefix, children))
-                return
-
-            output.append(f"{prefix}- {file_node}")
-            globally_visited.add(file_node)
+        for root in roots:
+            # Frames are (file_node, prefix); a None prefix marks the point
+            # where file_node's subtree is done and it leaves current_path.
+            stack: list[tuple[str, str | None]] = [(root, "")]
+            while stack:
+                file_node, prefix = stack.pop()
+                if prefix is None:
+                    current_path.remove(file_node)
+                    continue
+
+                if file_node in current_path:
+                    output.append(f"{prefix}- {file_node} (cycle)")
+                    continue
+
+                children = sorted_children.get(file_node, [])
+                if file_node in globally_visited:
+                    output.append(
+                        self._format_visited_node(file_node, prefix, children)
+                    )
+                    continue
 
-            if children:
-                current_path.add(file_node)
-                for child in children:
-                    _build_tree(child, prefix + "  ")
-                current_path.remove(file_node)
+                output.append(f"{prefix}- {file_node}")
+                globally_visited.add(file_node)
 
-        for root in roots:
-            _build_tree(root)
+                if children:
+                    current_path.add(file_node)
+                    stack.append((file_node, None))
+                    child_prefix = prefix + "  "
+                    stack.extend((child, child_prefix) for child in reversed(children))
             output.append("")
 
         return "\n".join(output).strip()
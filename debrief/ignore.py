@@ -3,60 +3,245 @@
 import fnmatch
 import logging
 import os
-from pathlib import Path
+import re
+from collections.abc import Iterable
+from functools import lru_cache
 
 from .constants import DEFAULT_IGNORE
+from .resolve import _is_racy
 
 logger = logging.getLogger(__name__)
 
 
+_DEFAULT_PATTERNS = frozenset(DEFAULT_IGNORE)
+# One non-blank, non-comment .gitignore line, without surrounding whitespace.
+_GITIGNORE_LINE = re.compile(r"^[^\S\n]*([^#\s][^\n]*?)[^\S\n]*$", re.MULTILINE)
+
+# normcase is the identity on POSIX; skip the call there on the hot path.
+_FOLD_CASE = os.path.normcase("A") != "A"
+
+_WILDCARDS = "*?["
+_SEPARATORS = "/" + os.sep
+
+
+def _compile(patterns: Iterable[str]) -> re.Pattern:
+    """Compiles fnmatch patterns into one alternation (never matches if empty)."""
+    translated = [fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns]
+    return re.compile("|".join(translated) if translated else r"(?!)")
+
+
+class IgnoreMatcher:
+    """A set of ignore patterns compiled for fast matching.
+
+    Matches exactly like calling fnmatch on the basename and the relative
+    path for every pattern, plus a check of each path component against
+    the pattern with slashes stripped. Literal patterns (the bulk of
+    DEFAULT_IGNORE) reduce to set lookups; only wildcard patterns reach
+    the regex engine, and only patterns that can span a separator are
+    tried against multi-component relative paths.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """Classifies and compiles the patterns.
+
+        Args:
+            patterns: Gitignore-style patterns.
+        """
+        self.patterns = tuple(sorted(set(patterns)))
+        has_wildcard = [
+            any(char in pattern for char in _WILDCARDS) for pattern in self.patterns
+        ]
+        has_separator = [
+            any(char in pattern for char in _SEPARATORS) for pattern in self.patterns
+        ]
+        # A basename holds no separator, so only separator-free patterns can
+        # match it; of those, literals are plain equality.
+        self.literals = frozenset(
+            os.path.normcase(pattern)
+            for pattern, wild, sep in zip(self.patterns, has_wildcard, has_separator)
+            if not wild and not sep
+        )
+        # A separator inside a bracket expression ("[!/]oo") is only a
+        # character class, so such patterns may still match a basename.
+        self.name_regex = _compile(
+            pattern
+            for pattern, wild, sep in zip(self.patterns, has_wildcard, has_separator)
+            if wild and (not sep or "[" in pattern)
+        )
+        # A relative path with several components can only be matched by
+        # patterns that contain a separator or a wildcard that spans one.
+        self.path_regex = _compile(
+            pattern
+            for pattern, wild, sep in zip(self.patterns, has_wildcard, has_separator)
+            if wild or sep
+        )
+        self.components = frozenset(pattern.strip("/") for pattern in self.patterns)
+        # Paths under an ignored top-level directory (.git/, node_modules/)
+        # are rejected by one prefix check before any splitting.
+        self.dir_prefixes = tuple(
+            component + os.sep
+            for component in sorted(self.components)
+            if component and not any(char in component for char in _SEPARATORS)
+        )
+
+    def _matches_regex(self, rel: str, name: str, folded: str) -> bool:
+        """Applies the wildcard basename and relative-path checks."""
+        if self.name_regex.match(folded):
+            return True
+        if rel == name:
+            return False
+        return bool(self.path_regex.match(os.path.normcase(rel) if _FOLD_CASE else rel))
+
+    def matches(self, rel: str, name: str) -> bool:
+        """Checks a path against the compiled patterns.
+
+        The set lookups run first, so paths under a literal pattern such
+        as ``node_modules`` are rejected without touching the regexes.
+
+        Args:
+            rel: Path relative to the project root.
+            name: Basename of the path.
+
+        Returns:
+            True if any pattern matches.
+        """
+        folded = os.path.normcase(name) if _FOLD_CASE else name
+        if folded in self.literals:
+            return True
+        if rel == name:
+            if name in self.components:
+                return True
+        elif rel.startswith(self.dir_prefixes) or not self.components.isdisjoint(
+            rel.split(os.sep)
+        ):
+            return True
+        return self._matches_regex(rel, name, folded)
+
+    def matches_child(self, rel: str, name: str) -> bool:
+        """Checks a path whose parent directories are known not to match.
+
+        Skips the component check for ancestors, so walkers can test each
+        entry by name without re-examining the whole relative path.
+
+        Args:
+            rel: Path relative to the project root.
+            name: Basename of the path.
+
+        Returns:
+            True if any pattern matches.
+        """
+        folded = os.path.normcase(name) if _FOLD_CASE else name
+        return (
+            name in self.components
+            or folded in self.literals
+            or self._matches_regex(rel, name, folded)
+        )
+
+
+@lru_cache(maxsize=32)
+def _compile_pattern_set(patterns: frozenset[str]) -> IgnoreMatcher:
+    """Builds the matcher for one distinct pattern set."""
+    return IgnoreMatcher(patterns)
+
+
+def compile_patterns(patterns: Iterable[str]) -> IgnoreMatcher:
+    """Compiles ignore patterns, reusing the matcher for a known pattern set.
+
+    Projects scanned in the same process mostly share DEFAULT_IGNORE and
+    a handful of .gitignore lines, so their matchers are built only once.
+
+    Args:
+        patterns: Gitignore-style patterns.
+
+    Returns:
+        The compiled IgnoreMatcher.
+    """
+    return _compile_pattern_set(frozenset(patterns))
+
+
 def load_gitignore(
     root_path: str, extra_patterns: list[str] | None = None
-) -> list[str]:
+) -> IgnoreMatcher:
     """Loads the .gitignore file from the root path.
 
+    Results are cached per root and .gitignore modification time, so
+    repeated calls only cost a stat until the file changes. A .gitignore
+    modified within the last couple of seconds is read afresh.
+
     Args:
         root_path: The root path of the project.
         extra_patterns: Optional list of additional patterns to exclude.
 
     Returns:
-        A list of patterns read from the .gitignore file.
+        An IgnoreMatcher built from the default patterns, the .gitignore
+        file and any extra patterns.
     """
-    patterns = set(DEFAULT_IGNORE)
-    gitignore_path = Path(root_path) / ".gitignore"
-    if gitignore_path.exists():
+    gitignore_path = os.path.join(root_path, ".gitignore")
+    try:
+        stat = os.stat(gitignore_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        stamp = None
+    extra = tuple(extra_patterns) if extra_patterns else ()
+    if stamp is not None and _is_racy(stamp[0]):
+        return _load_gitignore(root_path, stamp, extra)
+    return _load_gitignore_cached(root_path, stamp, extra)
+
+
+def _load_gitignore(
+    root_path: str,
+    stamp: tuple[int, int] | None,
+    extra_patterns: tuple[str, ...],
+) -> IgnoreMatcher:
+    """Reads .gitignore, if stamp says it exists, and compiles the patterns."""
+    patterns = []
+    if stamp is not None:
         try:
-            for raw_line in gitignore_path.read_text(encoding="utf-8").splitlines():
-                line = raw_line.strip()
-                if line and not line.startswith("#"):
-                    patterns.add(line)
+            with open(os.path.join(root_path, ".gitignore"), encoding="utf-8") as file:
+                patterns = _GITIGNORE_LINE.findall(file.read())
         except Exception:
             logger.debug("Failed to read .gitignore", exc_info=True)
-    if extra_patterns:
-        patterns.update(extra_patterns)
-    return list(patterns)
+    # frozenset() returns a frozenset argument as is, so this adds no copy.
+    return compile_patterns(_DEFAULT_PATTERNS.union(patterns, extra_patterns))
+
+
+@lru_cache(maxsize=32)
+def _load_gitignore_cached(
+    root_path: str,
+    stamp: tuple[int, int] | None,
+    extra_patterns: tuple[str, ...],
+) -> IgnoreMatcher:
+    """Caches _load_gitignore; stamp only keys the cache."""
+    return _load_gitignore(root_path, stamp, extra_patterns)
 
 
-def is_ignored(path: str, root_path: str, patterns: list[str]) -> bool:
+def invalidate() -> None:
+    """Drops all cached .gitignore results and compiled matchers."""
+    _load_gitignore_cached.cache_clear()
+    _compile_pattern_set.cache_clear()
+
+
+def is_ignored(
+    path: str, root_path: str, patterns: IgnoreMatcher, rel: str | None = None
+) -> bool:
     """Checks if a file path matches any of the ignore patterns.
 
     Args:
         path: Path to check.
         root_path: Project root directory.
-        patterns: List of ignore patterns.
+        patterns: Compiled ignore patterns.
+        rel: Path relative to root_path, if the caller already has it.
+            Computed by slicing when path is under root_path.
 
     Returns:
         True if the path should be ignored, False otherwise.
     """
-    rel = os.path.relpath(path, root_path)
-    if rel == ".":
+    if rel is None:
+        root_prefix = root_path if root_path.endswith(os.sep) else root_path + os.sep
+        if path.startswith(root_prefix):
+            rel = path[len(root_prefix) :]
+        else:
+            rel = os.path.relpath(path, root_path)
+    if rel in ("", "."):
         return False
-    name = os.path.basename(path)
-    for pattern in patterns:
-        if fnmatch.fnmatch(name, pattern):
-            return True
-        if fnmatch.fnmatch(rel, pattern):
-            return True
-        if pattern.strip("/") in rel.split(os.sep):
-            return True
-    return False
+    return patterns.matches(rel, os.path.basename(path))
@@ -7,7 +7,46 @@ from debrief.constants import (
     DOC_THRESHOLD_WARN,
     MIN_DOCSTRING_CHARS,
 )
-from debrief.resolve import check_dependencies, log
+from debrief.resolve import check_dependencies, log, resolve_pyproject
+
+
+def _has_min_chars(text, minimum):
+    """Checks whether text has at least minimum chars besides spaces/newlines/tabs.
+
+    Stops scanning as soon as the threshold is reached, so long docstrings
+    cost only their first few characters.
+
+    Args:
+        text: The text to check.
+        minimum: Required number of non-whitespace characters.
+
+    Returns:
+        True if the threshold is met.
+    """
+    count = 0
+    for char in text:
+        if char not in " \n\t":
+            count += 1
+            if count >= minimum:
+                return True
+    return count >= minimum
+
+
+def raw_docstring(node):
+    """Returns a node's docstring exactly as written, without cleandoc.
+
+    Args:
+        node: The AST node (FunctionDef, ClassDef, etc).
+
+    Returns:
+        The docstring, or None if the node has none.
+    """
+    body = node.body
+    if body and type(body[0]) is ast.Expr:
+        value = body[0].value
+        if type(value) is ast.Constant and type(value.value) is str:
+            return value.value
+    return None
 
 
 class ProjectLinter:
@@ -22,11 +61,20 @@ class ProjectLinter:
         """
         self.root = root_path
         self.include_docstrings = include_docstrings
-        self.doc_stats = {"total": 0, "missing": 0}
+        # Plain attributes rather than a dict: track_doc runs once per
+        # class and function, so the counters sit on a hot path.
+        self.doc_total = 0
+        self.doc_missing = 0
         self.short_docstrings = []
 
+    @property
+    def doc_stats(self):
+        """The docstring counters as a {"total", "missing"} dictionary."""
+        return {"total": self.doc_total, "missing": self.doc_missing}
+
     def check_metadata(self):
-        """Checks for pyproject.toml / requirements.txt presence."""
+        """Validates pyproject.toml and checks a dependency file exists."""
+        resolve_pyproject(self.root)
         check_dependencies(self.root)
 
     def track_doc(self, node):
@@ -34,27 +82,44 @@ class ProjectLinter:
 
         Args:
             node: The AST node (FunctionDef, ClassDef, etc).
+
+        Returns:
+            The node's raw docstring, or None, so callers that also render
+            it need not look it up again.
         """
-        self.doc_stats["total"] += 1
-        docstring = ast.get_docstring(node)
+        self.doc_total += 1
+        # Only presence and non-whitespace length matter here, and neither
+        # changes under inspect.cleandoc, so the raw docstring is enough.
+        docstring = raw_docstring(node)
 
-        if not docstring:
-            self.doc_stats["missing"] += 1
-            return
+        if not docstring or docstring.isspace():
+            self.doc_missing += 1
+            return docstring
 
-        if self.include_docstrings:
-            non_whitespace_count = len(
-                docstring.replace(" ", "").replace("\n", "").replace("\t", "")
-            )
-            if non_whitespace_count < MIN_DOCSTRING_CHARS:
-                name = getattr(node, "name", "<unknown>")
-                self.short_docstrings.append(name)
+        if self.include_docstrings and not _has_min_chars(
+            docstring, MIN_DOCSTRING_CHARS
+        ):
+            name = getattr(node, "name", "<unknown>")
+            self.short_docstrings.append(name)
+        return docstring
+
+    def merge_stats(self, doc_total, doc_missing, short_docstrings):
+        """Adds docstring statistics gathered by another linter.
+
+        Args:
+            doc_total: The other linter's count of documentable nodes.
+            doc_missing: The other linter's count of missing docstrings.
+            short_docstrings: The other linter's short docstring names.
+        """
+        self.doc_total += doc_total
+        self.doc_missing += doc_missing
+        self.short_docstrings.extend(short_docstrings)
 
     def print_summary(self):
         """Prints a summary of the docstring coverage."""
-        total = self.doc_stats["total"]
+        total = self.doc_total
         if total > 0:
-            missing = self.doc_stats["missing"]
+            missing = self.doc_missing
             coverage = ((total - missing) / total) * 100
             if coverage >= DOC_THRESHOLD_OK:
                 level = "OK"
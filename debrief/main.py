@@ -4,22 +4,46 @@ import argparse
 import logging
 import os
 import sys
-from pathlib import Path
+from collections.abc import Iterable, Iterator
+from itertools import chain, islice
 
 from debrief.analysis import Analyzer
 from debrief.ignore import load_gitignore
 from debrief.linting import ProjectLinter
 from debrief.resolve import (
-    format_fenced_block,
-    get_project_dependencies,
     get_project_description,
+    load_project_dependencies,
     resolve_readme,
     truncate_line,
+    write_fenced_block,
 )
 from debrief.tree import get_adaptive_tree
 
 logger = logging.getLogger(__name__)
 
+_SEP_IS_SLASH = os.sep == "/"
+
+
+def _positive_int(value: str) -> int:
+    """Parses a command-line value that must be an integer of at least 1.
+
+    Args:
+        value: The raw option value.
+
+    Returns:
+        The parsed integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 
 def parse_arguments() -> argparse.Namespace:
     """Parses command-line arguments.
@@ -84,6 +108,18 @@ def parse_arguments() -> argparse.Namespace:
         default=None,
         help="Max top-level defs per module (default: max_definitions/3)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="Number of parser processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk cache of per-file analysis results",
+    )
     parser.add_argument(
         "--exclude",
         action="append",
@@ -93,6 +129,62 @@ def parse_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _default_cache_dir() -> str:
+    """Returns the directory used to cache analysis results between runs.
+
+    Returns:
+        $XDG_CACHE_HOME/debrief, falling back to ~/.cache/debrief.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "debrief")
+
+
+def _file_url(path: str) -> str:
+    """Converts an absolute path to the file:/// link used in BRIEF.md."""
+    if _SEP_IS_SLASH:
+        return f"file:///{path}"
+    return f"file:///{path.replace(os.sep, '/')}"
+
+
+def _head_lines(chunks: Iterable[str], max_lines: int) -> tuple[list[str], bool]:
+    """Splits text into lines like str.splitlines, stopping after max_lines.
+
+    Only max_lines + 1 lines are ever produced: enough to tell whether the
+    text was truncated without splitting (or reading) the rest of it.
+
+    Args:
+        chunks: The text in pieces that end on line boundaries, such as an
+            open file or _line_chunks.
+        max_lines: Maximum number of lines to return.
+
+    Returns:
+        The first max_lines lines, and whether there were more.
+    """
+    split = chain.from_iterable(chunk.splitlines() for chunk in chunks)
+    lines = list(islice(split, max_lines + 1))
+    return lines[:max_lines], len(lines) > max_lines
+
+
+def _line_chunks(text: str) -> Iterator[str]:
+    """Yields text one newline-terminated piece at a time.
+
+    Slices lazily instead of wrapping text in a StringIO, which would copy
+    all of it up front.
+
+    Args:
+        text: The text to split.
+
+    Yields:
+        Consecutive pieces of text, each ending in a newline but the last.
+    """
+    start = 0
+    while end := text.find("\n", start) + 1:
+        yield text[start:end]
+        start = end
+    if start < len(text):
+        yield text[start:]
+
+
 def _read_readme(root: str, max_lines: int) -> str:
     """Reads the README file and returns its truncated content.
 
@@ -108,16 +200,15 @@ def _read_readme(root: str, max_lines: int) -> str:
         return "_README is empty or missing._"
 
     try:
-        text = Path(readme_path).read_text(encoding="utf-8")
+        with open(readme_path, encoding="utf-8") as readme_file:
+            lines, truncated = _head_lines(readme_file, max_lines)
     except Exception:
         logger.debug("Could not read README at %s", readme_path, exc_info=True)
         return "_README is empty or missing._"
 
-    lines = text.splitlines()
-    content = "\n".join([truncate_line(line) for line in lines[:max_lines]])
-    if len(lines) > max_lines:
-        link = f"file:///{readme_path.replace(os.sep, '/')}"
-        content += f"\n... (truncated) [Read more]({link})"
+    content = "\n".join(truncate_line(line) for line in lines)
+    if truncated:
+        content += f"\n... (truncated) [Read more]({_file_url(readme_path)})"
     return content
 
 
@@ -131,21 +222,15 @@ def _build_deps_content(root: str, max_deps: int) -> str:
     Returns:
         The dependencies content as a string.
     """
-    deps = get_project_dependencies(root)
+    deps, dep_path = load_project_dependencies(root)
     if not deps:
         return "_No dependencies found._"
 
-    dep_file_path = (
-        "pyproject.toml"
-        if Path(root, "pyproject.toml").exists()
-        else "requirements.txt"
+    content = "\n".join(
+        truncate_line(dependency) for dependency in islice(deps, max_deps)
     )
-    abs_dep_path = Path(root) / dep_file_path
-
-    content = "\n".join([truncate_line(dependency) for dependency in deps[:max_deps]])
     if len(deps) > max_deps:
-        link = f"file:///{str(abs_dep_path).replace(os.sep, '/')}"
-        content += f"\n... (truncated) [Read more]({link})"
+        content += f"\n... (truncated) [Read more]({_file_url(dep_path)})"
     return content
 
 
@@ -186,6 +271,8 @@ def main() -> None:
         include_docstrings=args.include_docstrings,
         max_class_methods=max_class_methods,
         max_module_defs=max_module_defs,
+        max_workers=args.jobs or os.cpu_count(),
+        cache_dir=None if args.no_cache else _default_cache_dir(),
     )
     analyzer.scan()
     linter.print_summary()
@@ -201,61 +288,45 @@ def main() -> None:
         else max(1, args.tree_budget // 3)
     )
     tree_str = get_adaptive_tree(root, args.tree_budget, patterns, max_tree_siblings)
-    tree_content = "\n".join([truncate_line(line) for line in tree_str.splitlines()])
+    tree_content = "\n".join(truncate_line(line) for line in tree_str.splitlines())
 
-    import_lines = analyzer.get_import_tree().splitlines()
-    import_tree = "\n".join(
-        [truncate_line(line) for line in import_lines[: args.max_imports]]
+    import_lines, truncated = _head_lines(
+        _line_chunks(analyzer.get_import_tree()), args.max_imports
     )
-    if len(import_lines) > args.max_imports:
+    import_tree = "\n".join(truncate_line(line) for line in import_lines)
+    if truncated:
         import_tree += "\n... (truncated)"
 
-    def_lines = analyzer.definitions
-    split_defs = []
-    for block in def_lines:
-        split_defs.extend(block.splitlines())
-
-    definitions = "\n".join(
-        [truncate_line(line) for line in split_defs[: args.max_definitions]]
+    def_lines, truncated = _head_lines(
+        _line_chunks(analyzer.get_definitions_text()),
+        args.max_definitions,
     )
-    if len(split_defs) > args.max_definitions:
+    definitions = "\n".join(truncate_line(line) for line in def_lines)
+    if truncated:
         definitions += "\n... (truncated)"
 
     description = get_project_description(root)
     display_description = f"> {description}" if description else ""
 
-    readme_block = format_fenced_block(readme_content, "markdown")
-    deps_block = format_fenced_block(deps_content, "text")
-    tree_block = format_fenced_block(tree_content, "text")
-    import_block = format_fenced_block(import_tree, "text")
-
-    final_markdown = f"""# BRIEF: {os.path.basename(root)}
-
-{display_description}
-
-## 1. Overview (README)
-
-{readme_block}
-
-## 2. Dependencies
-
-{deps_block}
-
-## 3. Directory Structure
-
-{tree_block}
-
-## 4. Import Tree
-
-{import_block}
-
-## 5. Module Definitions
-
-{definitions.strip()}
-"""
+    sections = [
+        ("1. Overview (README)", readme_content, "markdown"),
+        ("2. Dependencies", deps_content, "text"),
+        ("3. Directory Structure", tree_content, "text"),
+        ("4. Import Tree", import_tree, "text"),
+    ]
 
+    # Sections go straight to the file instead of being joined into one
+    # document first, so the output never exists twice in memory.
     with open(args.output, "w", encoding="utf-8") as output_file:
-        output_file.write(final_markdown)
+        output_file.write(f"# BRIEF: {os.path.basename(root)}\n\n")
+        output_file.write(f"{display_description}\n")
+        for title, content, lang in sections:
+            output_file.write(f"\n## {title}\n\n")
+            write_fenced_block(output_file, content, lang)
+            output_file.write("\n")
+        output_file.write("\n## 5. Module Definitions\n\n")
+        output_file.write(definitions.strip())
+        output_file.write("\n")
 
     logging.info(f"\n✅ Done! Context written to {args.output}")
 
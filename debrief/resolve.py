@@ -1,10 +1,11 @@
 """Utilities for resolving project files and parsing metadata."""
 
 import logging
+import os
+import time
 import tomllib
 from functools import lru_cache
-from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 from debrief.constants import (
     DEFAULT_DESCRIPTION,
@@ -14,6 +15,19 @@ from debrief.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Caches keyed on a file's mtime skip anything modified more recently
+# than this, since a change in the same mtime tick would go unnoticed
+# (see _is_racy and Analyzer.scan).
+_RACY_MTIME_NS = 2_000_000_000
+
+# Icon and root-logger function for each log() severity; anything
+# unrecognized is reported like "OK".
+_LOG_TABLE = {
+    "FAIL": ("❌", logging.error),
+    "WARN": ("⚠️", logging.warning),
+    "OK": ("✅", logging.info),
+}
+
 
 def log(level: str, msg: str) -> None:
     """Logs a message with an icon based on the severity level.
@@ -22,34 +36,176 @@ def log(level: str, msg: str) -> None:
         level: The severity level ("FAIL", "WARN", "OK").
         msg: The message to log.
     """
-    icon = "❌" if level == "FAIL" else "⚠️" if level == "WARN" else "✅"
-    if level == "FAIL":
-        logging.error(f"{icon}  {msg}")
-    elif level == "WARN":
-        logging.warning(f"{icon}  {msg}")
-    else:
-        logging.info(f"{icon}  {msg}")
+    icon, log_function = _LOG_TABLE.get(level, _LOG_TABLE["OK"])
+    log_function("%s  %s", icon, msg)
 
 
-@lru_cache(maxsize=16)
-def _load_pyproject(root: Path) -> Optional[dict]:
-    """Loads and caches the parsed pyproject.toml data.
+def _read_small_text(path: str) -> str:
+    """Reads a small UTF-8 file with raw os calls, skipping the io stack.
+
+    Line endings are left as they are; callers split with str.splitlines
+    or parse TOML, both of which accept CRLF.
+
+    Args:
+        path: Path of the file to read.
+
+    Returns:
+        The decoded file contents.
+    """
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(path, flags)
+    try:
+        chunks = []
+        while chunk := os.read(fd, 1 << 16):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks).decode("utf-8")
+
+
+def _is_racy(mtime_ns: int) -> bool:
+    """Returns whether an mtime is too recent to key a cache on."""
+    return time.time_ns() - mtime_ns < _RACY_MTIME_NS
+
+
+def _load_pyproject(root: str) -> Optional[dict]:
+    """Loads the parsed pyproject.toml data, cached until the file changes.
+
+    Costs one stat per call once the file has been parsed; the cache is
+    keyed on the file's modification time and size, so edits made while
+    the process runs are picked up. Files modified within the last couple
+    of seconds are parsed afresh.
 
     Args:
         root: Project root directory.
 
     Returns:
-        The parsed TOML dictionary, or None on error.
+        The parsed TOML dictionary, an empty dictionary if the file exists
+        but cannot be read or parsed, or None if there is no file.
     """
-    toml_path = root / "pyproject.toml"
-    if not toml_path.exists():
+    toml_path = os.path.join(root, "pyproject.toml")
+    try:
+        stat = os.stat(toml_path)
+    except OSError:
         return None
+    if _is_racy(stat.st_mtime_ns):
+        return _parse_pyproject(toml_path)
+    return _parse_pyproject_cached(toml_path, (stat.st_mtime_ns, stat.st_size))
+
+
+def _parse_pyproject(toml_path: str) -> Optional[dict]:
+    """Reads and parses pyproject.toml, returning {} if that fails."""
     try:
-        data = tomllib.loads(toml_path.read_text(encoding="utf-8"))
-        return data
-    except Exception:
-        logger.debug("Failed to parse pyproject.toml", exc_info=True)
+        return tomllib.loads(_read_small_text(toml_path))
+    except FileNotFoundError:
         return None
+    except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError):
+        logger.debug("Failed to parse pyproject.toml", exc_info=True)
+        return {}
+
+
+@lru_cache(maxsize=16)
+def _parse_pyproject_cached(toml_path: str, stamp: tuple[int, int]) -> Optional[dict]:
+    """Caches _parse_pyproject; stamp only keys the cache."""
+    return _parse_pyproject(toml_path)
+
+
+def _list_dir(path: str) -> dict[str, os.DirEntry]:
+    """Returns a directory's entries by name, or nothing if unreadable.
+
+    Listings are cached on the directory's mtime, which changes whenever
+    an entry is added, removed or renamed, so repeat lookups in the same
+    project cost one stat. Directories modified within the last couple
+    of seconds are listed afresh, since a change in the same mtime tick
+    would otherwise go unnoticed.
+
+    Args:
+        path: Directory to list.
+
+    Returns:
+        The directory entries keyed by name.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    if _is_racy(mtime_ns):
+        return _scan_dir(path)
+    return _scan_dir_cached(path, mtime_ns)
+
+
+def _scan_dir(path: str) -> dict[str, os.DirEntry]:
+    """Lists a directory with scandir, returning nothing if unreadable."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name: entry for entry in entries}
+    except OSError:
+        return {}
+
+
+@lru_cache(maxsize=64)
+def _scan_dir_cached(path: str, mtime_ns: int) -> dict[str, os.DirEntry]:
+    """Caches _scan_dir; mtime_ns only keys the cache."""
+    return _scan_dir(path)
+
+
+def _is_listed_file(entries: dict[str, os.DirEntry], directory: str, name: str) -> bool:
+    """Checks whether directory holds a file called name, given its listing.
+
+    The listing holds exact names only, so a name missing from it is
+    stat'ed instead: on case-insensitive file systems (the macOS and
+    Windows defaults) requirements.txt also matches a Requirements.txt.
+
+    Args:
+        entries: The directory's entries, as returned by _list_dir.
+        directory: Path of the directory.
+        name: The file name to look for.
+
+    Returns:
+        True if name is a file, following symlinks.
+    """
+    entry = entries.get(name)
+    if entry is not None:
+        return entry.is_file()
+    return os.path.isfile(os.path.join(directory, name))
+
+
+def _is_listed_dir(entries: dict[str, os.DirEntry], directory: str, name: str) -> bool:
+    """Checks whether directory holds a subdirectory called name.
+
+    Like _is_listed_file, falls back to a stat for names the listing lacks.
+    """
+    entry = entries.get(name)
+    if entry is not None:
+        return entry.is_dir()
+    return os.path.isdir(os.path.join(directory, name))
+
+
+def _has_min_lines(text: str, minimum: int) -> bool:
+    """Checks whether text has at least minimum non-blank lines.
+
+    Slices out one line at a time and stops at the minimum, so a long
+    README is neither copied nor split in full.
+
+    Args:
+        text: The text to check.
+        minimum: Required number of non-blank lines.
+
+    Returns:
+        True if the threshold is met.
+    """
+    count = 0
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start) + 1 or length
+        for line in text[start:end].splitlines():
+            if line.strip():
+                count += 1
+                if count >= minimum:
+                    return True
+        start = end
+    return count >= minimum
 
 
 def resolve_readme(root: str) -> Optional[str]:
@@ -63,7 +219,6 @@ def resolve_readme(root: str) -> Optional[str]:
     Returns:
         Absolute path to README or None.
     """
-    root_path = Path(root)
     candidates = [
         "README.md",
         "docs/README.md",
@@ -71,24 +226,32 @@ def resolve_readme(root: str) -> Optional[str]:
         "readme.md",
     ]
 
+    # Root names are looked up in the cached root listing (see
+    # _is_listed_file); a subdirectory candidate is stat'ed only once its
+    # parent is known to be a directory.
+    root_entries = _list_dir(root)
     for rel_name in candidates:
-        abs_path = root_path / rel_name
-        if abs_path.exists():
-            rel = abs_path.relative_to(root_path)
-
+        parent, _, name = rel_name.rpartition("/")
+        rel = os.path.normpath(rel_name)
+        abs_path = os.path.join(root, rel)
+        if not parent:
+            is_file = _is_listed_file(root_entries, root, name)
+        else:
+            has_parent = _is_listed_dir(root_entries, root, parent)
+            is_file = has_parent and os.path.isfile(abs_path)
+        if is_file:
             try:
-                text = abs_path.read_text(encoding="utf-8")
-            except Exception:
+                text = _read_small_text(abs_path)
+            except (OSError, UnicodeDecodeError):
                 logger.debug("Could not read %s", rel, exc_info=True)
                 log("FAIL", f"Could not read {rel}")
                 continue
 
             if not text.strip():
                 log("FAIL", f"README found at {rel} is empty!")
-                return str(abs_path)
+                return abs_path
 
-            non_empty_lines = [line for line in text.splitlines() if line.strip()]
-            if len(non_empty_lines) < MIN_README_LINES:
+            if not _has_min_lines(text, MIN_README_LINES):
                 log(
                     "WARN",
                     f"{rel} is very short"
@@ -97,7 +260,7 @@ def resolve_readme(root: str) -> Optional[str]:
             else:
                 log("OK", f"Found README at {rel}")
 
-            return str(abs_path)
+            return abs_path
 
     log("FAIL", "No README found! (Checked root, docs/, .github/)")
     return None
@@ -112,17 +275,17 @@ def resolve_pyproject(root: str) -> Optional[str]:
     Returns:
         Absolute path to pyproject.toml or None.
     """
-    root_path = Path(root)
-    toml_path = root_path / "pyproject.toml"
-    if not toml_path.exists():
+    data = _load_pyproject(root)
+    if data is None:
         return None
 
-    description = get_project_description(root)
-    if not description or not description.strip():
+    description = data.get("project", {}).get("description")
+    stripped = description.strip() if description else ""
+    if not stripped:
         log("FAIL", "pyproject.toml has empty/missing description.")
-    elif description.strip() == DEFAULT_DESCRIPTION:
+    elif stripped == DEFAULT_DESCRIPTION:
         log("WARN", "pyproject.toml has the default description.")
-    elif len(description.replace(" ", "")) < MIN_DESCRIPTION_CHARS:
+    elif len(description) - description.count(" ") < MIN_DESCRIPTION_CHARS:
         log(
             "WARN",
             f"pyproject.toml description is very short"
@@ -130,7 +293,7 @@ def resolve_pyproject(root: str) -> Optional[str]:
         )
     else:
         log("OK", "Found pyproject.toml")
-    return str(toml_path)
+    return os.path.join(root, "pyproject.toml")
 
 
 def resolve_requirements(root: str) -> Optional[str]:
@@ -142,24 +305,23 @@ def resolve_requirements(root: str) -> Optional[str]:
     Returns:
         Absolute path to requirements.txt or None.
     """
-    req_path = Path(root) / "requirements.txt"
-    if req_path.exists():
-        return str(req_path)
+    if _is_listed_file(_list_dir(root), root, "requirements.txt"):
+        return os.path.join(root, "requirements.txt")
     return None
 
 
 def check_dependencies(root: str) -> None:
     """Checks if either pyproject.toml or requirements.txt exists.
 
-    Logs WARN if neither is found.
+    Logs WARN if neither is found. Only presence is checked, against the
+    cached root listing; validating pyproject.toml is left to
+    resolve_pyproject.
 
     Args:
         root: Project root directory.
     """
-    has_toml = resolve_pyproject(root) is not None
-    has_req = resolve_requirements(root) is not None
-
-    if not has_toml and not has_req:
+    has_toml = _is_listed_file(_list_dir(root), root, "pyproject.toml")
+    if not has_toml and resolve_requirements(root) is None:
         log("WARN", "No dependencies found (no requirements.txt or pyproject.toml).")
 
 
@@ -172,39 +334,51 @@ def get_project_description(root: str) -> Optional[str]:
     Returns:
         The project description string, or None if not found/error.
     """
-    data = _load_pyproject(Path(root))
+    data = _load_pyproject(root)
     if data is None:
         return None
     return data.get("project", {}).get("description")
 
 
-def get_project_dependencies(root: str) -> list[str]:
-    """Extracts project dependencies from pyproject.toml or requirements.txt.
+def load_project_dependencies(root: str) -> tuple[list[str], Optional[str]]:
+    """Extracts project dependencies along with the file they came from.
 
     Args:
         root: Project root directory.
 
     Returns:
-        A list of dependency strings.
+        A tuple of (dependency strings, absolute path of the pyproject.toml
+        or requirements.txt they were read from). The path is None if no
+        dependencies were found.
     """
-    data = _load_pyproject(Path(root))
+    data = _load_pyproject(root)
     if data is not None:
         deps = data.get("project", {}).get("dependencies")
         if isinstance(deps, list):
-            return deps
+            return deps, os.path.join(root, "pyproject.toml")
+
+    req_path = os.path.join(root, "requirements.txt")
+    try:
+        lines = _read_small_text(req_path).splitlines()
+    except FileNotFoundError:
+        return [], None
+    except (OSError, UnicodeDecodeError):
+        logger.debug("Failed to read requirements.txt", exc_info=True)
+        return [], None
+    deps = [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    return deps, req_path
+
+
+def get_project_dependencies(root: str) -> list[str]:
+    """Extracts project dependencies from pyproject.toml or requirements.txt.
 
-    req_path = Path(root) / "requirements.txt"
-    if req_path.exists():
-        try:
-            return [
-                line.strip()
-                for line in req_path.read_text(encoding="utf-8").splitlines()
-                if line.strip() and not line.startswith("#")
-            ]
-        except Exception:
-            logger.debug("Failed to read requirements.txt", exc_info=True)
+    Args:
+        root: Project root directory.
 
-    return []
+    Returns:
+        A list of dependency strings.
+    """
+    return load_project_dependencies(root)[0]
 
 
 def truncate_line(line: str, max_chars: int = 300) -> str:
@@ -235,5 +409,24 @@ def format_fenced_block(content: str, lang: str = "text") -> str:
     Returns:
         The formatted fenced code block string.
     """
-    safe_content = content.replace("```", "'''")
-    return f"```{lang}\n{safe_content}\n```"
+    if "```" in content:
+        content = content.replace("```", "'''")
+    return f"```{lang}\n{content}\n```"
+
+
+def write_fenced_block(output: TextIO, content: str, lang: str = "text") -> None:
+    """Writes content as a fenced code block straight to an open file.
+
+    Produces the same text as format_fenced_block without first building
+    the whole block as one string.
+
+    Args:
+        output: The text stream to write to.
+        content: The content to wrap in a fenced block.
+        lang: The language identifier for the block.
+    """
+    if "```" in content:
+        content = content.replace("```", "'''")
+    output.write(f"```{lang}\n")
+    output.write(content)
+    output.write("\n```")
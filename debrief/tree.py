@@ -1,14 +1,37 @@
 """Directory tree generation utilities."""
 
+import heapq
 import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-from .ignore import is_ignored
+from .ignore import IgnoreMatcher
+
+# Threads listing directories concurrently in get_adaptive_tree.
+TREE_WALK_THREADS = 8
+
+# Deepest level get_adaptive_tree will render.
+_MAX_DEPTH = 9
+
+_MIDDLE = "├── "
+_LAST = "└── "
+
+# Line prefixes per tree depth, as (middle entry, last entry).
+_PREFIXES = [
+    ("    " * depth + _MIDDLE, "    " * depth + _LAST)
+    for depth in range(_MAX_DEPTH + 1)
+]
+
+# A directory as shown in the tree: its (is_file, name, path, rel) entries
+# after ignore patterns and sibling limits, and the number hidden.
+_Listing = tuple[list[tuple[bool, str, str, str]], int]
 
 
 def generate_tree_at_depth(
     root_path: str,
     max_depth: int,
-    patterns: list[str],
+    patterns: IgnoreMatcher,
     max_siblings: int | None = None,
 ) -> str:
     """Generates a directory tree string up to a specific depth.
@@ -16,60 +39,169 @@ def generate_tree_at_depth(
     Args:
         root_path: The root directory to start the tree from.
         max_depth: The maximum depth to traverse.
-        patterns: List of gitignore patterns to exclude.
+        patterns: Compiled ignore patterns.
         max_siblings: Maximum number of items to show at each level.
 
     Returns:
         A string representing the directory tree.
     """
-    lines: list[str] = []
-
-    def walk(path: str, current_depth: int) -> None:
-        if current_depth > max_depth:
-            return
-        try:
-            items = os.listdir(path)
-        except PermissionError:
-            return
-
-        items = sorted(
-            items, key=lambda x: (not os.path.isdir(os.path.join(path, x)), x)
-        )
-        filtered_items = [
-            item
-            for item in items
-            if not is_ignored(os.path.join(path, item), root_path, patterns)
-        ]
+    return _render_tree(
+        root_path,
+        max_depth,
+        partial(_list_children, patterns.matches_child, max_siblings),
+    )
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    """Returns whether an entry is a directory, following symlinks."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
 
-        items_to_show = filtered_items
-        hidden_count = 0
-        if max_siblings is not None and len(filtered_items) > max_siblings:
-            items_to_show = filtered_items[:max_siblings]
-            hidden_count = len(filtered_items) - max_siblings
 
-        for index, item in enumerate(items_to_show):
-            is_last = index == len(items_to_show) - 1 and hidden_count == 0
-            prefix = "└── " if is_last else "├── "
-            indent = "    " * current_depth
-            lines.append(f"{indent}{prefix}{item}")
+def _list_children(
+    matches: Callable[[str, str], bool],
+    max_siblings: int | None,
+    path: str,
+    rel_dir: str,
+) -> _Listing | None:
+    """Lists the entries of one directory as the tree shows them.
 
-            full = os.path.join(path, item)
-            if os.path.isdir(full):
-                walk(full, current_depth + 1)
+    Entries are only descended into when shown, so every ancestor of an
+    entry has already passed the ignore check and matches_child suffices.
+
+    Args:
+        matches: The ignore check, called as matches(rel, name).
+        max_siblings: Maximum number of entries to show.
+        path: Absolute path of the directory.
+        rel_dir: Path of the directory relative to the tree root.
+
+    Returns:
+        The shown entries as (is_file, name, path, rel) tuples, directories
+        first, plus the number of entries hidden by max_siblings; None if
+        the directory cannot be read.
+    """
+    rel_prefix = rel_dir + os.sep if rel_dir else ""
+    # Ignored entries are dropped before their type is looked up or their
+    # path built. scandir yields entries in no particular order, so every
+    # one must still be seen; with a sibling cap only the shown entries
+    # are ordered, which spares the full sort of very large directories.
+    try:
+        with os.scandir(path) as entries:
+            items = [
+                (not _is_dir(entry), entry.name, rel_prefix + entry.name, entry)
+                for entry in entries
+                if not matches(rel_prefix + entry.name, entry.name)
+            ]
+    except PermissionError:
+        return None
+
+    hidden_count = 0
+    if max_siblings is not None and len(items) > max_siblings:
+        hidden_count = len(items) - max_siblings
+        items = heapq.nsmallest(max_siblings, items)
+    else:
+        items.sort()
+    # Relative paths are unique, so the DirEntry is never compared.
+    shown = [(is_file, name, entry.path, rel) for is_file, name, rel, entry in items]
+    return shown, hidden_count
+
+
+def _render_tree(
+    root_path: str,
+    max_depth: int,
+    list_children: Callable[[str, str], _Listing | None],
+) -> str:
+    """Renders the tree down to max_depth from directory listings.
+
+    Args:
+        root_path: The root directory.
+        max_depth: The maximum depth to traverse.
+        list_children: Returns a directory's listing as _list_children
+            does, given its absolute and relative paths.
+
+    Returns:
+        A string representing the directory tree.
+    """
+    lines = [os.path.basename(root_path) + "/"]
+    # Pending work in reverse output order: a str is a finished line, a
+    # tuple is a directory still to be listed as (path, rel path, depth).
+    stack: list[str | tuple[str, str, int]] = [(root_path, "", 0)]
+    while stack:
+        task = stack.pop()
+        if type(task) is str:
+            lines.append(task)
+            continue
+        path, rel_dir, depth = task
+        listing = list_children(path, rel_dir)
+        if listing is None:
+            continue
+        items_to_show, hidden_count = listing
+
+        if depth < len(_PREFIXES):
+            middle, last = _PREFIXES[depth]
+        else:
+            middle, last = "    " * depth + _MIDDLE, "    " * depth + _LAST
+        descend = depth < max_depth
+        tasks: list[str | tuple[str, str, int]] = []
+        last_index = len(items_to_show) - 1 if hidden_count == 0 else -1
+        for index, (is_file, name, full, rel) in enumerate(items_to_show):
+            tasks.append((last if index == last_index else middle) + name)
+            if descend and not is_file:
+                tasks.append((full, rel, depth + 1))
 
         if hidden_count > 0:
-            indent = "    " * current_depth
-            lines.append(f"{indent}└── ... ({hidden_count} more items hidden)")
+            tasks.append(f"{last}... ({hidden_count} more items hidden)")
 
-    lines.append(os.path.basename(root_path) + "/")
-    walk(root_path, 0)
+        stack.extend(reversed(tasks))
     return "\n".join(lines)
 
 
+def _prefetch_listings(
+    executor: ThreadPoolExecutor,
+    listings: dict[tuple[str, str], _Listing | None],
+    list_one: Callable[[str, str], _Listing | None],
+    root_path: str,
+    max_depth: int,
+) -> None:
+    """Lists every directory a render down to max_depth will show.
+
+    Works one level at a time and lists the directories of a level
+    concurrently; scandir releases the GIL while it waits on the file
+    system, so the threads overlap that latency.
+
+    Args:
+        executor: Thread pool to list directories on.
+        listings: Listings by (path, rel path), filled in place.
+        list_one: Lists one directory, as _list_children does.
+        root_path: The root directory.
+        max_depth: The deepest level the render will list.
+    """
+    level = [(root_path, "")]
+    for depth in range(max_depth + 1):
+        missing = [key for key in level if key not in listings]
+        if len(missing) > 1:
+            listings.update(
+                zip(missing, executor.map(lambda key: list_one(*key), missing))
+            )
+        elif missing:
+            listings[missing[0]] = list_one(*missing[0])
+        if depth == max_depth:
+            break
+        level = [
+            (full, rel)
+            for key in level
+            if listings[key] is not None
+            for is_file, _, full, rel in listings[key][0]
+            if not is_file
+        ]
+
+
 def get_adaptive_tree(
     root_path: str,
     max_lines: int,
-    patterns: list[str],
+    patterns: IgnoreMatcher,
     max_siblings: int | None = None,
 ) -> str:
     """Generates a directory tree that fits within a line budget.
@@ -80,25 +212,35 @@ def get_adaptive_tree(
     Args:
         root_path: The root directory.
         max_lines: The maximum number of lines allowed for the tree.
-        patterns: List of gitignore patterns.
+        patterns: Compiled ignore patterns.
         max_siblings: Maximum number of items to show at each level.
 
     Returns:
         The generated tree string.
     """
+    # Each depth covers the levels above it, so every directory is listed
+    # once and its listing reused by deeper renders in this call.
+    list_one = partial(_list_children, patterns.matches_child, max_siblings)
+    listings: dict[tuple[str, str], _Listing | None] = {}
+
+    def cached_listing(path: str, rel_dir: str) -> _Listing | None:
+        return listings[path, rel_dir]
+
     best_tree = ""
     last_count = 0
-    for depth in range(1, 10):
-        tree = generate_tree_at_depth(root_path, depth, patterns, max_siblings)
-        count = len(tree.splitlines())
-        if count > max_lines:
-            if 0 < last_count < (max_lines * 0.2):
-                return tree
-            if depth == 1:
+    with ThreadPoolExecutor(max_workers=TREE_WALK_THREADS) as executor:
+        for depth in range(1, _MAX_DEPTH + 1):
+            _prefetch_listings(executor, listings, list_one, root_path, depth)
+            tree = _render_tree(root_path, depth, cached_listing)
+            count = len(tree.splitlines())
+            if count > max_lines:
+                if 0 < last_count < (max_lines * 0.2):
+                    return tree
+                if depth == 1:
+                    return tree
+                return best_tree
+            if count == last_count and depth > 1:
                 return tree
-            return best_tree
-        if count == last_count and depth > 1:
-            return tree
-        best_tree = tree
-        last_count = count
+            best_tree = tree
+            last_count = count
     return best_tree
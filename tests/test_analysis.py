@@ -0,0 +1,237 @@
+"""Tests for the codebase analyzer."""
+
+import os
+import sys
+
+import pytest
+
+from debrief import analysis
+from debrief.analysis import PARALLEL_MIN_FILES, Analyzer
+from debrief.ignore import IgnoreMatcher, load_gitignore
+from debrief.linting import ProjectLinter
+
+
+@pytest.fixture()
+def package_directory(tmp_path):
+    """Creates a package with enough modules to trigger parallel parsing."""
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    for index in range(PARALLEL_MIN_FILES):
+        (package / f"mod{index}.py").write_text(
+            f"from .mod{(index + 1) % PARALLEL_MIN_FILES} import helper\n\n"
+            f"class Thing{index}(object):\n"
+            f'    """Thing number {index}."""\n\n'
+            f"    def run(self, value: int):\n"
+            f"        pass\n\n"
+            f"def helper{index}(name: str) -> str:\n"
+            f"    return name\n",
+            encoding="utf-8",
+        )
+    (package / "broken.py").write_text("def oops(:\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture()
+def parsed(monkeypatch):
+    """Records the relative path of every file _parse_one parses."""
+    parsed_paths = []
+    original_parse_one = analysis._parse_one
+
+    def _tracking_parse_one(options, path, rel_path, source=None):
+        parsed_paths.append(rel_path)
+        return original_parse_one(options, path, rel_path, source)
+
+    monkeypatch.setattr(analysis, "_parse_one", _tracking_parse_one)
+    return parsed_paths
+
+
+def _scan(root, max_workers):
+    """Scans root and returns the analyzer and its linter."""
+    linter = ProjectLinter(str(root), include_docstrings=True)
+    analyzer = Analyzer(
+        str(root), linter, load_gitignore(str(root)), max_workers=max_workers
+    )
+    analyzer.scan()
+    return analyzer, linter
+
+
+def _backdate(directory):
+    """Moves file mtimes an hour back, out of the cache's racy window."""
+    for path in directory.rglob("*"):
+        if path.is_file():
+            mtime_ns = path.stat().st_mtime_ns - 3600 * 10**9
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_parallel_scan_matches_sequential(package_directory):
+    """Verifies the process pool yields the same results as a serial scan."""
+    serial, serial_linter = _scan(package_directory, max_workers=1)
+    parallel, parallel_linter = _scan(package_directory, max_workers=2)
+
+    assert parallel.definitions == serial.definitions
+    assert parallel.import_graph == serial.import_graph
+    assert parallel_linter.doc_stats == serial_linter.doc_stats
+    assert parallel_linter.short_docstrings == serial_linter.short_docstrings
+
+
+def test_scan_skips_unparsable_files(package_directory):
+    """Verifies files with syntax errors are left out of the import graph."""
+    analyzer, linter = _scan(package_directory, max_workers=1)
+
+    assert "pkg/broken.py" not in analyzer.import_graph
+    assert analyzer.import_graph["pkg/mod0.py"] == {"pkg/mod1.py"}
+    assert linter.doc_total == 3 * PARALLEL_MIN_FILES
+
+
+def test_scan_skips_pathologically_nested_files(tmp_path):
+    """Verifies files too deeply nested to parse are skipped, not raised."""
+    (tmp_path / "deep.py").write_text(
+        "x = " + "+".join(["1"] * 200_000) + "\n", encoding="utf-8"
+    )
+    (tmp_path / "main.py").write_text("def run():\n    pass\n", encoding="utf-8")
+
+    analyzer, _ = _scan(tmp_path, max_workers=1)
+
+    assert "deep.py" not in analyzer.import_graph
+    assert "- def run()" in "".join(analyzer.definitions)
+
+
+def test_parse_one_leaves_imports_unresolved(tmp_path, monkeypatch):
+    """Verifies worker parses defer import resolution to the merge."""
+    (tmp_path / "main.py").write_text("import helpers\n", encoding="utf-8")
+    (tmp_path / "helpers.py").write_text("", encoding="utf-8")
+
+    def _unexpected_resolve(*args):
+        raise AssertionError("imports resolved in the worker")
+
+    monkeypatch.setattr(analysis, "_resolve_module", _unexpected_resolve)
+    options = analysis._ScanOptions(str(tmp_path), False, 5, 20)
+    result = analysis._parse_one(options, str(tmp_path / "main.py"), "main.py")
+
+    assert result[1] == [(str(tmp_path), "helpers")]
+
+
+def test_cache_reuses_unchanged_files(package_directory, tmp_path, parsed):
+    """Verifies a second scan only reparses files that changed."""
+    cache_dir = str(tmp_path / "cache")
+    _backdate(package_directory)
+    linter = ProjectLinter(str(package_directory))
+    first = Analyzer(
+        str(package_directory),
+        linter,
+        IgnoreMatcher(()),
+        max_workers=1,
+        cache_dir=cache_dir,
+    )
+    first.scan()
+
+    changed = package_directory / "pkg" / "mod0.py"
+    changed.write_text("def fresh():\n    pass\n", encoding="utf-8")
+
+    parsed.clear()
+    second = Analyzer(
+        str(package_directory),
+        ProjectLinter(str(package_directory)),
+        IgnoreMatcher(()),
+        max_workers=1,
+        cache_dir=cache_dir,
+    )
+    second.scan()
+
+    assert parsed == ["pkg/mod0.py"]
+    assert "- def fresh()" in "".join(second.definitions)
+    assert second.definitions.count("```text") == first.definitions.count("```text")
+
+
+def test_import_tree_marks_cycles_and_revisits(tmp_path):
+    """Verifies cycles and already printed subtrees are abbreviated."""
+    analyzer = Analyzer(str(tmp_path), ProjectLinter(str(tmp_path)), IgnoreMatcher(()))
+    analyzer.import_graph = {
+        "main.py": {"a.py", "b.py"},
+        "a.py": {"b.py"},
+        "b.py": {"a.py"},
+    }
+
+    assert analyzer.get_import_tree().splitlines() == [
+        "- main.py",
+        "  - a.py",
+        "    - b.py",
+        "      - a.py (cycle)",
+        "  - b.py (...)",
+    ]
+
+
+def test_import_tree_handles_deep_chains(tmp_path):
+    """Verifies import chains deeper than the recursion limit are rendered."""
+    depth = sys.getrecursionlimit() + 100
+    analyzer = Analyzer(str(tmp_path), ProjectLinter(str(tmp_path)), IgnoreMatcher(()))
+    analyzer.import_graph = {
+        f"m{index}.py": {f"m{index + 1}.py"} for index in range(depth)
+    }
+
+    lines = analyzer.get_import_tree().splitlines()
+    assert len(lines) == depth + 1
+    assert lines[-1] == "  " * depth + f"- m{depth}.py"
+
+
+def test_cache_refreshes_imports_when_files_are_added(tmp_path, parsed):
+    """Verifies cached imports are re-resolved, not reparsed, for new files."""
+    (tmp_path / "main.py").write_text("import helpers\n", encoding="utf-8")
+    _backdate(tmp_path)
+    cache_dir = str(tmp_path / ".cache")
+
+    def _graph():
+        analyzer = Analyzer(
+            str(tmp_path),
+            ProjectLinter(str(tmp_path)),
+            IgnoreMatcher([".cache"]),
+            max_workers=1,
+            cache_dir=cache_dir,
+        )
+        analyzer.scan()
+        return analyzer.import_graph
+
+    assert _graph() == {"main.py": set()}
+
+    (tmp_path / "helpers.py").write_text("", encoding="utf-8")
+
+    assert _graph() == {"main.py": {"helpers.py"}, "helpers.py": set()}
+    assert parsed == ["main.py", "helpers.py"]
+
+
+def test_cache_skips_recently_modified_files(tmp_path, parsed):
+    """Verifies files modified within the racy window are always reparsed."""
+    (tmp_path / "main.py").write_text("def run():\n    pass\n", encoding="utf-8")
+    for _ in range(2):
+        Analyzer(
+            str(tmp_path),
+            ProjectLinter(str(tmp_path)),
+            IgnoreMatcher(["cache"]),
+            max_workers=1,
+            cache_dir=str(tmp_path / "cache"),
+        ).scan()
+
+    assert parsed == ["main.py", "main.py"]
+
+
+def test_cache_is_keyed_on_the_interpreter(tmp_path, parsed, monkeypatch):
+    """Verifies results cached by another Python version are not reused."""
+    (tmp_path / "main.py").write_text("def run():\n    pass\n", encoding="utf-8")
+    _backdate(tmp_path)
+
+    def _scan_cached():
+        Analyzer(
+            str(tmp_path),
+            ProjectLinter(str(tmp_path)),
+            IgnoreMatcher(["cache"]),
+            max_workers=1,
+            cache_dir=str(tmp_path / "cache"),
+        ).scan()
+
+    _scan_cached()
+    _scan_cached()
+    monkeypatch.setattr(sys.implementation, "cache_tag", "other-interpreter")
+    _scan_cached()
+
+    assert parsed == ["main.py", "main.py"]
@@ -0,0 +1,119 @@
+"""Tests for gitignore pattern matching."""
+
+import fnmatch
+import os
+
+import pytest
+
+from debrief.ignore import IgnoreMatcher, is_ignored, load_gitignore
+
+
+@pytest.fixture()
+def matcher(tmp_path):
+    """Loads the default patterns plus a small .gitignore."""
+    (tmp_path / ".gitignore").write_text(
+        "# comment\n*.log\n/generated/\ndocs/_build\n", encoding="utf-8"
+    )
+    return load_gitignore(str(tmp_path), ["secret_*.py"])
+
+
+@pytest.mark.parametrize(
+    ("rel", "expected"),
+    [
+        ("main.py", False),
+        ("pkg/module.py", False),
+        ("pkg/__pycache__", True),
+        ("pkg/__pycache__/module.cpython-311.pyc", True),
+        ("debug.log", True),
+        ("pkg/nested/debug.log", True),
+        ("generated", True),
+        ("generated/output.py", True),
+        ("docs/_build", True),
+        ("docs/index.md", False),
+        ("pkg/secret_keys.py", True),
+        ("my.egg-info", True),
+        ("BRIEF.md", True),
+    ],
+)
+def test_is_ignored(tmp_path, matcher, rel, expected):
+    """Verifies paths are matched by basename, relative path or component."""
+    full = os.path.join(str(tmp_path), *rel.split("/"))
+    assert is_ignored(full, str(tmp_path), matcher) is expected
+
+
+def test_root_is_never_ignored(tmp_path, matcher):
+    """Verifies the project root itself is not ignored."""
+    assert not is_ignored(str(tmp_path), str(tmp_path), matcher)
+
+
+def test_comments_are_not_patterns(matcher):
+    """Verifies comment lines in .gitignore are skipped."""
+    assert "# comment" not in matcher.patterns
+
+
+def test_load_gitignore_picks_up_edits(tmp_path):
+    """Verifies cached results are refreshed when .gitignore changes."""
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text("*.log\n", encoding="utf-8")
+    first = load_gitignore(str(tmp_path))
+
+    assert load_gitignore(str(tmp_path)) is first
+
+    gitignore.write_text("*.log\n*.tmp\n", encoding="utf-8")
+    second = load_gitignore(str(tmp_path))
+
+    assert "*.tmp" in second.patterns
+    assert "*.tmp" not in first.patterns
+
+
+def test_load_gitignore_picks_up_same_size_edits(tmp_path):
+    """Verifies a same-size .gitignore edit within one mtime tick is seen."""
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text("*.log\n", encoding="utf-8")
+    mtime_ns = gitignore.stat().st_mtime_ns
+    load_gitignore(str(tmp_path))
+
+    gitignore.write_text("*.tmp\n", encoding="utf-8")
+    os.utime(gitignore, ns=(mtime_ns, mtime_ns))
+
+    assert "*.tmp" in load_gitignore(str(tmp_path)).patterns
+
+
+def test_matcher_agrees_with_fnmatch():
+    """Verifies the combined regexes match like per-pattern fnmatch calls."""
+    patterns = [
+        "*.py[co]",
+        "build",
+        "/dist/",
+        "docs/*.md",
+        "a?c",
+        "[!x]y",
+        "[!/]oo",
+        "*",
+    ]
+    paths = [
+        "x.pyc",
+        "src/build/x",
+        "build/x",
+        "dist",
+        "docs/a.md",
+        "docs/a.md/b",
+        "pkg/abc",
+        "zy",
+        "xy",
+        "foo",
+        "src/foo",
+    ]
+    for size in range(len(patterns) + 1):
+        subset = patterns[:size]
+        matcher = IgnoreMatcher(subset)
+        for rel in paths:
+            rel = rel.replace("/", os.sep)
+            name = os.path.basename(rel)
+            expected = any(
+                fnmatch.fnmatch(name, pattern)
+                or fnmatch.fnmatch(rel, pattern)
+                or pattern.strip("/") in rel.split(os.sep)
+                for pattern in subset
+            )
+            assert matcher.matches(rel, name) is expected, (subset, rel)
@@ -7,9 +7,16 @@ import textwrap
 
 import pytest
 
+from debrief import resolve
 from debrief.linting import ProjectLinter
 from debrief.main import main
-from debrief.resolve import resolve_pyproject, resolve_readme
+from debrief.resolve import (
+    check_dependencies,
+    get_project_description,
+    resolve_pyproject,
+    resolve_readme,
+    resolve_requirements,
+)
 
 
 @pytest.fixture()
@@ -46,6 +53,59 @@ def test_valid_readme_passes(project_directory, caplog):
     assert any("Found README" in record.message for record in caplog.records)
 
 
+def test_readme_found_when_listing_differs_in_case(project_directory, monkeypatch):
+    """Verifies a README missing from the listing by exact name is stat'ed."""
+    readme = project_directory / "README.md"
+    readme.write_text("# Title\nBody\n", encoding="utf-8")
+    # A case-insensitive file system lists it as Readme.md.
+    monkeypatch.setattr(resolve, "_list_dir", lambda path: {})
+
+    assert resolve_readme(str(project_directory)) == str(readme)
+
+
+def test_readme_subdirectory_found_when_listing_differs_in_case(
+    project_directory, monkeypatch
+):
+    """Verifies a docs/ directory missing from the listing is stat'ed."""
+    (project_directory / "docs").mkdir()
+    readme = project_directory / "docs" / "README.md"
+    readme.write_text("# Title\nBody\n", encoding="utf-8")
+    monkeypatch.setattr(resolve, "_list_dir", lambda path: {})
+
+    assert resolve_readme(str(project_directory)) == str(readme)
+
+
+def test_requirements_found_when_listing_differs_in_case(
+    project_directory, monkeypatch
+):
+    """Verifies requirements.txt missing from the listing is stat'ed."""
+    requirements = project_directory / "requirements.txt"
+    requirements.write_text("requests\n", encoding="utf-8")
+    monkeypatch.setattr(resolve, "_list_dir", lambda path: {})
+
+    assert resolve_requirements(str(project_directory)) == str(requirements)
+
+
+def test_readme_found_in_subdirectory(project_directory):
+    """Verifies README candidates under docs/ and .github/ are found."""
+    (project_directory / "docs").write_text("", encoding="utf-8")
+    github = project_directory / ".github"
+    github.mkdir()
+    (github / "README.md").write_text("# Title\nBody\n", encoding="utf-8")
+
+    assert resolve_readme(str(project_directory)) == str(github / "README.md")
+
+
+def test_readme_skips_dangling_symlinks(project_directory, caplog):
+    """Verifies a broken README symlink falls through to the next candidate."""
+    (project_directory / "README.md").symlink_to(project_directory / "missing.md")
+    readme = project_directory / "readme.md"
+    readme.write_text("# Title\nBody\n", encoding="utf-8")
+
+    assert resolve_readme(str(project_directory)) == str(readme)
+    assert "Could not read" not in caplog.text
+
+
 def test_short_description_warns(project_directory, caplog):
     """Verifies that a short pyproject.toml description triggers WARN."""
     _write_pyproject(project_directory, description="Short")
@@ -66,6 +126,42 @@ def test_default_description(project_directory, caplog):
     assert "pyproject.toml has the default description." in caplog.text
 
 
+def test_malformed_pyproject_counts_as_missing_description(project_directory, caplog):
+    """Verifies that an unparsable pyproject.toml is reported, not raised."""
+    (project_directory / "pyproject.toml").write_text("[project\n", encoding="utf-8")
+
+    assert resolve_pyproject(str(project_directory)) is not None
+    assert "empty/missing description" in caplog.text
+
+
+def test_dependency_check_only_checks_presence(project_directory, caplog):
+    """Verifies the dependency check warns without validating metadata."""
+    with caplog.at_level(logging.DEBUG):
+        check_dependencies(str(project_directory))
+    assert "No dependencies found" in caplog.text
+
+    caplog.clear()
+    _write_pyproject(project_directory)
+    with caplog.at_level(logging.DEBUG):
+        check_dependencies(str(project_directory))
+    assert caplog.text == ""
+
+
+def test_dependency_check_requires_files(project_directory, caplog, monkeypatch):
+    """Verifies only real files count, whatever the listing's name case."""
+    (project_directory / "pyproject.toml").mkdir()
+    with caplog.at_level(logging.DEBUG):
+        check_dependencies(str(project_directory))
+    assert "No dependencies found" in caplog.text
+
+    caplog.clear()
+    (project_directory / "requirements.txt").write_text("requests\n", encoding="utf-8")
+    monkeypatch.setattr(resolve, "_list_dir", lambda path: {})
+    with caplog.at_level(logging.DEBUG):
+        check_dependencies(str(project_directory))
+    assert caplog.text == ""
+
+
 def test_valid_description_passes(project_directory, caplog):
     """Verifies that a long enough description logs OK."""
     _write_pyproject(
@@ -77,6 +173,27 @@ def test_valid_description_passes(project_directory, caplog):
     assert any("Found pyproject.toml" in record.message for record in caplog.records)
 
 
+def test_description_picks_up_edits(project_directory):
+    """Verifies the cached pyproject.toml is reparsed after it changes."""
+    _write_pyproject(project_directory, description="First")
+    assert get_project_description(str(project_directory)) == "First"
+
+    _write_pyproject(project_directory, description="A longer second one")
+    assert get_project_description(str(project_directory)) == "A longer second one"
+
+
+def test_description_picks_up_same_size_edits(project_directory):
+    """Verifies a same-size edit within one mtime tick is not served stale."""
+    _write_pyproject(project_directory, description="First")
+    toml_path = project_directory / "pyproject.toml"
+    mtime_ns = toml_path.stat().st_mtime_ns
+    assert get_project_description(str(project_directory)) == "First"
+
+    _write_pyproject(project_directory, description="Other")
+    os.utime(toml_path, ns=(mtime_ns, mtime_ns))
+    assert get_project_description(str(project_directory)) == "Other"
+
+
 def test_short_docstring_warns(project_directory, caplog):
     """Verifies that a tiny docstring triggers WARN."""
     source_file = project_directory / "example.py"
@@ -134,3 +251,18 @@ def test_lint_mode_no_brief(project_directory, monkeypatch):
     assert raised_exit.value.code == 0
     brief_path = os.path.join(str(project_directory), "BRIEF.md")
     assert not os.path.exists(brief_path)
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_jobs_below_one_is_rejected(project_directory, monkeypatch, capsys, jobs):
+    """Verifies --jobs values below 1 fail instead of running serially."""
+    monkeypatch.setattr(
+        "sys.argv",
+        ["debrief", "lint", str(project_directory), "--jobs", jobs],
+    )
+
+    with pytest.raises(SystemExit) as raised_exit:
+        main()
+
+    assert raised_exit.value.code == 2
+    assert "must be at least 1" in capsys.readouterr().err
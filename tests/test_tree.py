@@ -0,0 +1,66 @@
+"""Tests for directory tree generation."""
+
+import pytest
+
+from debrief.ignore import load_gitignore
+from debrief.tree import generate_tree_at_depth, get_adaptive_tree
+
+
+@pytest.fixture()
+def project_directory(tmp_path):
+    """Creates a small project with ignored and nested directories."""
+    root = tmp_path / "proj"
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "pkg" / "__pycache__").mkdir()
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "pkg" / "sub" / "deep.py").write_text("", encoding="utf-8")
+    (root / "pkg" / "__pycache__" / "mod.pyc").write_text("", encoding="utf-8")
+    for name in ("a.py", "b.py", "c.py"):
+        (root / "pkg" / name).write_text("", encoding="utf-8")
+    (root / "main.py").write_text("", encoding="utf-8")
+    (root / "debug.log").write_text("", encoding="utf-8")
+    (root / ".gitignore").write_text("*.log\n", encoding="utf-8")
+    return root
+
+
+def test_tree_skips_ignored_entries(project_directory):
+    """Verifies ignored files and directories are neither shown nor walked."""
+    patterns = load_gitignore(str(project_directory))
+    tree = generate_tree_at_depth(str(project_directory), 3, patterns)
+
+    assert tree.splitlines() == [
+        "proj/",
+        "├── pkg",
+        "    ├── sub",
+        "        └── deep.py",
+        "    ├── a.py",
+        "    ├── b.py",
+        "    └── c.py",
+        "├── .gitignore",
+        "└── main.py",
+    ]
+
+
+def test_tree_hides_extra_siblings(project_directory):
+    """Verifies entries beyond max_siblings are summarized."""
+    patterns = load_gitignore(str(project_directory))
+    tree = generate_tree_at_depth(str(project_directory), 1, patterns, 2)
+
+    assert tree.splitlines()[2:6] == [
+        "    ├── sub",
+        "    ├── a.py",
+        "    └── ... (2 more items hidden)",
+        "├── .gitignore",
+    ]
+
+
+def test_adaptive_tree_fits_budget(project_directory):
+    """Verifies the deepest tree within the line budget is chosen."""
+    patterns = load_gitignore(str(project_directory))
+
+    assert get_adaptive_tree(str(project_directory), 8, patterns) == (
+        generate_tree_at_depth(str(project_directory), 1, patterns)
+    )
+    assert get_adaptive_tree(str(project_directory), 60, patterns) == (
+        generate_tree_at_depth(str(project_directory), 9, patterns)
+    )